@@ -1,36 +1,76 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
+from cachetools import TTLCache
+from app.api.deps import get_llm_service, get_vector_store
 from app.models.chat import ChatRequest, ChatResponse, DocumentSource
 from app.services.llm_service import LLMService
 from app.services.vector_store import VectorStore
+import hashlib
 import uuid
 
 router = APIRouter()
-llm_service = LLMService()
-vector_store = VectorStore()
+
+# Short-lived cache of retrieval results keyed by normalized query text.
+# The TTL is kept short so freshly ingested documents show up quickly.
+_query_cache = TTLCache(maxsize=2048, ttl=60)
+
+# Shown until documents have been added to the vector store
+_PLACEHOLDER_SOURCE = DocumentSource(
+    filename="placeholder.txt",
+    chunk_text="This is a placeholder source chunk",
+    relevance_score=0.8
+)
+
+def _query_cache_key(query: str) -> bytes:
+    """Build a compact cache key from the normalized query text"""
+    return hashlib.blake2b(query.lower().encode(), digest_size=16).digest()
+
+async def _search_similar_cached(vector_store: VectorStore, message: str, n_results: int = 5):
+    """Search the vector store, reusing recent results for repeated queries"""
+    # Normalize once so the cache key and the search see the same query
+    query = message.strip()
+    key = _query_cache_key(query)
+    similar_chunks = _query_cache.get(key)
+    if similar_chunks is None:
+        similar_chunks = await vector_store.search_similar(query=query, n_results=n_results)
+        _query_cache[key] = similar_chunks
+    return similar_chunks
+
+def _mk_source(chunk: dict) -> DocumentSource:
+    """Build a source entry with a truncated preview of the chunk text"""
+    text = chunk.get("text", "")
+    preview = (text[:200] + "...") if len(text) > 200 else text
+    # Chunks come from our own vector store, so validation can be skipped
+    return DocumentSource.model_construct(
+        filename=chunk.get("filename", "unknown"),
+        chunk_text=preview,
+        relevance_score=chunk.get("score", 0.0)
+    )
 
 @router.post("/chat", response_model=ChatResponse)
-async def chat(request: ChatRequest):
+async def chat(
+    request: ChatRequest,
+    llm_service: LLMService = Depends(get_llm_service),
+    vector_store: VectorStore = Depends(get_vector_store)
+):
     """Send a message and get AI response"""
     try:
         # Generate conversation ID if not provided
-        conversation_id = request.conversation_id or str(uuid.uuid4())
-        
-        # For now, return a simple echo response
-        # Later we'll add vector search and LLM integration
+        conversation_id = request.conversation_id or uuid.uuid4().hex
+
+        # Retrieve relevant chunks (cached for repeated queries); an empty store
+        # has nothing to retrieve, so its placeholder never reaches the prompt
+        similar_chunks = []
+        if vector_store.documents:
+            similar_chunks = await _search_similar_cached(vector_store, request.message)
+
         response = await llm_service.generate_response(
             message=request.message,
-            conversation_id=conversation_id
+            conversation_id=conversation_id,
+            context_documents=similar_chunks
         )
-        
-        # Placeholder sources
-        sources = [
-            DocumentSource(
-                filename="placeholder.txt",
-                chunk_text="This is a placeholder source chunk",
-                relevance_score=0.8
-            )
-        ]
-        
+
+        sources = [_mk_source(chunk) for chunk in similar_chunks[:3]] or [_PLACEHOLDER_SOURCE]
+
         return ChatResponse(
             response=response,
             sources=sources,
@@ -42,4 +82,4 @@ async def chat(request: ChatRequest):
 @router.get("/chat/history/{conversation_id}")
 async def get_chat_history(conversation_id: str):
     """Get chat history for a conversation"""
-    return {"conversation_id": conversation_id, "messages": []}
\ No newline at end of file
+    return {"conversation_id": conversation_id, "messages": []}
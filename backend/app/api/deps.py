@@ -0,0 +1,13 @@
+from functools import lru_cache
+from app.services.llm_service import LLMService
+from app.services.vector_store import VectorStore
+
+@lru_cache()
+def get_llm_service() -> LLMService:
+    """Shared LLM service instance for the process"""
+    return LLMService()
+
+@lru_cache()
+def get_vector_store() -> VectorStore:
+    """Shared vector store instance for the process"""
+    return VectorStore()
@@ -1,4 +1,5 @@
 from fastapi import APIRouter, HTTPException, UploadFile, File, status
+from fastapi.responses import ORJSONResponse
 from typing import List
 from app.models.document import DocumentListResponse, Document, DocumentUploadResponse
 from app.services.document_processor import DocumentProcessor
@@ -8,15 +9,26 @@ import os
 router = APIRouter()
 doc_processor = DocumentProcessor()
 
+# Upload outcome keyed by (any succeeded, any failed) -> (status code, message template)
+_UPLOAD_OUTCOMES = {
+    (False, True): (status.HTTP_400_BAD_REQUEST, "All file uploads failed"),
+    (True, True): (status.HTTP_207_MULTI_STATUS, "Uploaded {success_count} files successfully, {error_count} failed"),
+    (True, False): (status.HTTP_201_CREATED, "Successfully uploaded {success_count} files"),
+    (False, False): (status.HTTP_201_CREATED, "Successfully uploaded {success_count} files"),
+}
+
 @router.get("/documents", response_model=DocumentListResponse)
 async def list_documents():
     """List all documents in the documents folder"""
     try:
         documents = await doc_processor.scan_documents_folder()
-        return DocumentListResponse(
+        # The listing is built server-side, so return it pre-serialized and skip
+        # FastAPI's response-model validation. Upload keeps full validation.
+        response = DocumentListResponse.model_construct(
             documents=documents,
             total_count=len(documents)
         )
+        return ORJSONResponse(content=response.model_dump(mode="json"))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error listing documents: {str(e)}")
 
@@ -63,18 +75,11 @@ async def upload_documents(
         success_count = len(uploaded_files)
         error_count = len(errors)
         
-        if success_count == 0 and error_count > 0:
-            # All files failed
-            response_message = "All file uploads failed"
-            response_status = status.HTTP_400_BAD_REQUEST
-        elif success_count > 0 and error_count > 0:
-            # Partial success
-            response_message = f"Uploaded {success_count} files successfully, {error_count} failed"
-            response_status = status.HTTP_207_MULTI_STATUS
-        else:
-            # All files succeeded
-            response_message = f"Successfully uploaded {success_count} files"
-            response_status = status.HTTP_201_CREATED
+        response_status, message_template = _UPLOAD_OUTCOMES[(success_count > 0, error_count > 0)]
+        response_message = message_template.format(
+            success_count=success_count,
+            error_count=error_count
+        )
         
         response = DocumentUploadResponse(
             message=response_message,
@@ -84,12 +89,12 @@ async def upload_documents(
             errors=error_messages if error_messages else None
         )
         
-        # For partial failures, we still want to return a success status
-        # but include error information in the response
-        if error_count > 0 and success_count == 0:
-            raise HTTPException(
+        # Failed and partially failed uploads return the response body directly
+        # with the matching status code instead of raising
+        if error_count > 0:
+            return ORJSONResponse(
                 status_code=response_status,
-                detail=response.dict()
+                content=response.model_dump(mode="json", exclude_none=True)
             )
         
         return response
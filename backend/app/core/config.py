@@ -1,5 +1,6 @@
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import FrozenSet
+from functools import lru_cache
 import os
 
 class Settings(BaseSettings):
@@ -7,11 +8,20 @@ class Settings(BaseSettings):
     documents_folder: str = "/app/documents"
     vector_store_path: str = "/app/data/chroma_db"
     
+    # Extraction settings
+    use_pdftotext: bool = False  # Requires poppler-utils in the image
+    max_concurrent_docs: int = 0  # 0 uses the CPU count
+    extract_cache_max_mb: int = 256  # Least recently used extracted text is evicted past this
+    
+    # Embedding settings
+    query_embedding_cache_size: int = 10000
+    
     # File upload settings
     max_file_size_mb: int = 10
     max_files_per_upload: int = 10
-    allowed_file_types: List[str] = ["application/pdf", "application/vnd.openxmlformats-officedocument.wordprocessingml.document", "text/plain", "text/markdown"]
-    allowed_extensions: List[str] = [".pdf", ".docx", ".txt", ".md"]
+    max_concurrent_uploads: int = 8
+    allowed_file_types: FrozenSet[str] = frozenset({"application/pdf", "application/vnd.openxmlformats-officedocument.wordprocessingml.document", "text/plain", "text/markdown"})
+    allowed_extensions: FrozenSet[str] = frozenset({".pdf", ".docx", ".txt", ".md"})
     
     @property
     def max_file_size_bytes(self) -> int:
@@ -21,4 +31,9 @@ class Settings(BaseSettings):
     class Config:
         env_file = ".env"
 
-settings = Settings()
\ No newline at end of file
+@lru_cache()
+def get_settings() -> Settings:
+    """Load settings once per process"""
+    return Settings()
+
+settings = get_settings()
\ No newline at end of file
@@ -1,9 +1,14 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from app.api import documents, chat
 from app.core.config import settings
 
-app = FastAPI(title="Document Chatbot API", version="1.0.0")
+app = FastAPI(
+    title="Document Chatbot API",
+    version="1.0.0",
+    default_response_class=ORJSONResponse
+)
 
 # CORS middleware for frontend communication
 app.add_middleware(
@@ -25,6 +30,5 @@ async def health_check():
 @app.get("/api/health/llm")
 async def llm_health_check():
     """Check LLM service health"""
-    from app.services.llm_service import LLMService
-    llm_service = LLMService()
-    return await llm_service.health_check()
\ No newline at end of file
+    from app.api.deps import get_llm_service
+    return await get_llm_service().health_check()
\ No newline at end of file
@@ -1,11 +1,15 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import List, Optional
 
 class ChatRequest(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
     message: str
     conversation_id: Optional[str] = None
 
 class DocumentSource(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
     filename: str
     chunk_text: str
     relevance_score: float
@@ -1,54 +1,192 @@
 import os
 import uuid
+import asyncio
+import codecs
+import hashlib
+import logging
+import subprocess
 import magic
 import re
-import aiofiles
 from datetime import datetime
-from typing import List, Tuple, Optional
+from typing import List, Tuple, Optional, BinaryIO, TYPE_CHECKING
 from pathlib import Path
 from fastapi import UploadFile
 from app.models.document import Document, UploadedFileInfo, UploadValidationError
 from app.core.config import settings
-import PyPDF2
-from docx import Document as DocxDocument
-import markdown
+
+if TYPE_CHECKING:
+    import pypdf
+
+logger = logging.getLogger(__name__)
+
+# Size of the chunks used when streaming uploads to disk
+_UPLOAD_CHUNK_SIZE = 64 * 1024
+
+# Leading bytes passed to MIME detection; libmagic only inspects the file header
+# (OOXML detection looks past the first zip entry, so keep some headroom)
+_MIME_SNIFF_SIZE = 8 * 1024
+_MAGIC = magic.Magic(mime=True)
+
+# Common MIME type variations reported by libmagic for allowed types
+_MIME_MAPPINGS = {
+    "text/x-markdown": "text/markdown",
+    "application/x-empty": "text/plain"  # Empty files
+}
+
+_DOCX_MIME = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+# Upload naming pattern: YYYYMMDD_HHMMSS_XXXXXXXX_originalname.ext
+_UPLOAD_NAME_RE = re.compile(r'^\d{8}_\d{6}_[a-f0-9]{8}_(.+)$')
+_UNSAFE_CHARS_RE = re.compile(r'[<>:"/\\|?*]')
+_SUPPORTED_EXT = frozenset({'.pdf', '.docx', '.txt', '.md'})
+_RESERVED_NAMES = frozenset({'con', 'prn', 'aux', 'nul', *(f'com{i}' for i in range(1, 10)), *(f'lpt{i}' for i in range(1, 10))})
+
+# Markdown syntax stripped for plain-text extraction. Images and links keep their text, which
+# then has its own emphasis removed. Emphasis is only stripped when the markers pair up around
+# text, so "2 * 3" survives; underscore pairs around a bare word such as __init__ are kept too.
+_MD_LINK_RE = re.compile(r'!?\[([^\]]*)\]\([^)]*\)')
+_MD_EMPHASIS_RE = re.compile(
+    r'(?<![\w*])(\*{1,3})(?![\s*])(.+?)(?<![\s*])\1(?![\w*])'
+    r'|(?<![\w_])(_{1,3})(?![\s_])(.+?)(?<![\s_])\3(?![\w_])'
+)
+_MD_MARKUP_RE = re.compile(r'^[ \t]{0,3}#{1,6}[ \t]+|^[ \t]{0,3}>[ \t]?|`+', re.M)
+
+# Pages sampled to detect scanned (image-only) PDFs before full extraction
+_PDF_PROBE_PAGES = 3
+# Form XObjects nested deeper than this are assumed to contain text
+_PDF_FORM_MAX_DEPTH = 4
+
+# WordprocessingML read directly when extracting DOCX text. Paragraphs include table cells
+# and text boxes, but not the mc:Fallback copy Word stores next to each text box.
+_DOCX_NAMESPACES = {
+    "w": "http://schemas.openxmlformats.org/wordprocessingml/2006/main",
+    "mc": "http://schemas.openxmlformats.org/markup-compatibility/2006",
+}
+_DOCX_PARAGRAPHS_XPATH = ".//w:p[not(ancestor::mc:Fallback)]"
+_DOCX_OWN_RUNS_XPATH = "./w:r | ./w:hyperlink/w:r"
+_W_NS = "{%s}" % _DOCX_NAMESPACES["w"]
+_W_T = f"{_W_NS}t"
+_W_BR = f"{_W_NS}br"
+_W_BR_TYPE = f"{_W_NS}type"
+_W_RUN_SPECIALS = {
+    f"{_W_NS}tab": "\t",
+    f"{_W_NS}ptab": "\t",
+    f"{_W_NS}cr": "\n",
+    f"{_W_NS}noBreakHyphen": "-",
+}
+
+# Namespace for deterministic document ids derived from the file path
+_DOC_NS = uuid.UUID("6ba7b810-9dad-11d1-80b4-00c04fd430c8")
+
+# Bump whenever extractor output changes so cached text is not reused
+_EXTRACTOR_VERSION = 9
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+def _sniff_mime(head: bytes, filename: str) -> Optional[str]:
+    """Recognize the allowed types from their header bytes; None means ask libmagic"""
+    if head.startswith(b"%PDF-"):
+        return "application/pdf"
+    
+    ext = filename[filename.rfind('.'):].lower()
+    if ext == '.docx':
+        # OOXML is a zip whose first entries name the word/ part
+        return _DOCX_MIME if head.startswith(b"PK\x03\x04") and b"word/" in head else None
+    
+    if ext in ('.txt', '.md') and b"\x00" not in head:
+        try:
+            # Non-final decode tolerates a multi-byte character cut off at the end of the head
+            codecs.getincrementaldecoder('utf-8')().decode(head)
+        except UnicodeDecodeError:
+            return None
+        return "text/markdown" if ext == '.md' else "text/plain"
+    
+    return None
+
+def _docx_run_child_text(child) -> str:
+    """Text a run child contributes, matching python-docx's Run.text"""
+    if child.tag == _W_T:
+        return child.text or ""
+    if child.tag == _W_BR:
+        # Page and column breaks carry a w:type; only line breaks become newlines
+        return "\n" if child.get(_W_BR_TYPE, "textWrapping") == "textWrapping" else ""
+    return _W_RUN_SPECIALS.get(child.tag, "")
+
+def _strip_md_emphasis(match: "re.Match[str]") -> str:
+    """Unwrap an emphasis match, keeping underscores around a bare identifier"""
+    if match.group(1):
+        return match.group(2)
+    text = match.group(4)
+    return text if re.search(r'\W', text) else match.group(0)
+
+def _write_upload(source: BinaryIO, file_path: str) -> Tuple[int, bytes]:
+    """Copy an upload to disk in chunks, returning its size and first chunk"""
+    file_size = 0
+    first_chunk = b""
+    source.seek(0)
+    # Write under a temporary name so folder scans never pick up a partial file
+    tmp_path = f"{file_path}.part"
+    try:
+        with open(tmp_path, 'wb') as f:
+            while chunk := source.read(_UPLOAD_CHUNK_SIZE):
+                if not first_chunk:
+                    first_chunk = chunk
+                f.write(chunk)
+                file_size += len(chunk)
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+    return file_size, first_chunk
 
 class DocumentProcessor:
     def __init__(self):
         self.documents_folder = settings.documents_folder
+        self._extract_cache_dir = Path(self.documents_folder) / ".extract_cache"
+        # Last scan result keyed on the folder's mtime; cleared when uploads land
+        self._scan_cache: Optional[Tuple[int, List[Document]]] = None
+        # Shared across requests so concurrent uploads are capped process-wide
+        self._upload_semaphore = asyncio.Semaphore(settings.max_concurrent_uploads)
     
     async def scan_documents_folder(self) -> List[Document]:
         """Scan the documents folder and return list of documents"""
         documents = []
         
-        if not os.path.exists(self.documents_folder):
+        try:
+            mtime = os.stat(self.documents_folder).st_mtime_ns
+        except FileNotFoundError:
             return documents
         
-        for filename in os.listdir(self.documents_folder):
-            if self._is_supported_file(filename):
-                file_path = os.path.join(self.documents_folder, filename)
+        if self._scan_cache is not None and self._scan_cache[0] == mtime:
+            return list(self._scan_cache[1])
+        
+        # scandir entries carry their path, and is_file() answers from the directory entry type
+        # without a syscall; entry.stat() below still costs one stat call per document on Linux
+        with os.scandir(self.documents_folder) as entries:
+            for entry in entries:
+                if not self._is_supported_file(entry.name) or not entry.is_file():
+                    continue
                 
                 # Extract original filename if this was an uploaded file
-                display_filename = self._extract_original_filename(filename)
+                display_filename = self._extract_original_filename(entry.name)
                 
                 document = Document(
-                    id=str(uuid.uuid4()),
+                    id=uuid.uuid5(_DOC_NS, entry.path).hex,
                     filename=display_filename,
-                    file_path=file_path,
+                    file_path=entry.path,
                     status="ready",
-                    created_at=datetime.fromtimestamp(os.path.getctime(file_path)),
+                    created_at=datetime.fromtimestamp(entry.stat().st_ctime),
                     chunk_count=0
                 )
                 documents.append(document)
         
-        return documents
+        self._scan_cache = (mtime, documents)
+        return list(documents)
     
     def _extract_original_filename(self, filename: str) -> str:
         """Extract original filename from uploaded file naming convention"""
-        # Check if filename follows our upload naming pattern: YYYYMMDD_HHMMSS_XXXXXXXX_originalname.ext
-        import re
-        pattern = r'^\d{8}_\d{6}_[a-f0-9]{8}_(.+)$'
-        match = re.match(pattern, filename)
+        # Check if filename follows our upload naming pattern
+        match = _UPLOAD_NAME_RE.match(filename)
         
         if match:
             return match.group(1)  # Return the original filename part
@@ -57,44 +195,179 @@ class DocumentProcessor:
     
     def _is_supported_file(self, filename: str) -> bool:
         """Check if file type is supported"""
-        supported_extensions = ['.pdf', '.docx', '.txt', '.md']
-        return any(filename.lower().endswith(ext) for ext in supported_extensions)
+        return filename[filename.rfind('.'):].lower() in _SUPPORTED_EXT
     
     async def extract_text_from_file(self, file_path: str) -> str:
-        """Extract text from a file based on its type"""
-        filename = os.path.basename(file_path).lower()
+        """Extract text from a file based on its type; extraction errors propagate to the caller"""
+        # Parsing is blocking, so run it off the event loop in a single thread hop
+        return await asyncio.to_thread(self._extract_sync, file_path)
+    
+    def _extract_sync(self, file_path: str) -> str:
+        """Extract text, reusing cached output for unchanged file contents"""
+        cache_path = self._extract_cache_dir / f"{self._content_key(file_path)}.txt"
+        try:
+            # pypdf can emit lone surrogates; surrogatepass round-trips them exactly
+            text = cache_path.read_text(encoding='utf-8', errors='surrogatepass')
+        except FileNotFoundError:
+            pass
+        else:
+            # Refresh the mtime so eviction drops the least recently used entries first
+            try:
+                os.utime(cache_path)
+            except OSError:
+                pass
+            return text
+        
+        text = self._extract_by_type(file_path)
         
+        tmp_path = cache_path.with_name(f"{cache_path.stem}.{uuid.uuid4().hex}.tmp")
         try:
-            if filename.endswith('.pdf'):
-                return self._extract_from_pdf(file_path)
-            elif filename.endswith('.docx'):
-                return self._extract_from_docx(file_path)
-            elif filename.endswith('.txt'):
-                return self._extract_from_txt(file_path)
-            elif filename.endswith('.md'):
-                return self._extract_from_markdown(file_path)
-            else:
-                return ""
-        except Exception as e:
-            print(f"Error extracting text from {file_path}: {e}")
+            self._extract_cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path.write_text(text, encoding='utf-8', errors='surrogatepass')
+            os.replace(tmp_path, cache_path)
+            self._prune_extract_cache()
+        except (OSError, UnicodeError):
+            logger.warning("Error caching extracted text for %s", file_path, exc_info=True)
+            # A failed write (e.g. ENOSPC) must not leave a partial temp file behind
+            try:
+                tmp_path.unlink(missing_ok=True)
+            except OSError:
+                pass
+        
+        return text
+    
+    def _prune_extract_cache(self) -> None:
+        """Evict least recently used cache entries until the cache fits its size limit"""
+        entries = []
+        with os.scandir(self._extract_cache_dir) as it:
+            for entry in it:
+                if entry.is_file():
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+        
+        excess = sum(size for _, size, _ in entries) - settings.extract_cache_max_mb * 1024 * 1024
+        if excess <= 0:
+            return
+        
+        entries.sort()
+        for _, size, path in entries:
+            if excess <= 0:
+                break
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            excess -= size
+    
+    def _content_key(self, file_path: str) -> str:
+        """Hash the extractor version and backend, file type, size and bytes into a cache key"""
+        suffix = Path(file_path).suffix.lower()
+        # PDFs can be extracted by either pypdf or pdftotext, which produce different text
+        backend = f":pdftotext={settings.use_pdftotext}" if suffix == '.pdf' else ""
+        hasher = hashlib.sha256()
+        hasher.update(f"v{_EXTRACTOR_VERSION}:{suffix}{backend}".encode())
+        with open(file_path, 'rb') as file:
+            # Size from the open descriptor instead of a separate stat on the path
+            hasher.update(os.fstat(file.fileno()).st_size.to_bytes(8, "little"))
+            while chunk := file.read(_HASH_CHUNK_SIZE):
+                hasher.update(chunk)
+        return hasher.hexdigest()
+    
+    def _extract_by_type(self, file_path: str) -> str:
+        """Dispatch to the extractor for the file's type"""
+        filename = os.path.basename(file_path).lower()
+        
+        if filename.endswith('.pdf'):
+            return self._extract_from_pdf(file_path)
+        elif filename.endswith('.docx'):
+            return self._extract_from_docx(file_path)
+        elif filename.endswith('.txt'):
+            return self._extract_from_txt(file_path)
+        elif filename.endswith('.md'):
+            return self._extract_from_markdown(file_path)
+        else:
             return ""
     
     def _extract_from_pdf(self, file_path: str) -> str:
         """Extract text from PDF file"""
-        text = ""
+        if settings.use_pdftotext:
+            return self._extract_from_pdf_with_pdftotext(file_path)
+        
+        # Imported here so workers using pdftotext or cached text never load pypdf
+        import pypdf
+        
         with open(file_path, 'rb') as file:
-            pdf_reader = PyPDF2.PdfReader(file)
-            for page in pdf_reader.pages:
-                text += page.extract_text() + "\n"
-        return text
+            pdf_reader = pypdf.PdfReader(file)
+            if pdf_reader.is_encrypted and not pdf_reader.decrypt(""):
+                logger.warning("Skipping password-protected PDF %s", file_path)
+                return ""
+            
+            probe_pages = pdf_reader.pages[:_PDF_PROBE_PAGES]
+            if not any(self._pdf_page_may_have_text(page) for page in probe_pages):
+                logger.warning("Skipping image-only PDF %s", file_path)
+                return ""
+            
+            return "".join(page.extract_text() + "\n" for page in pdf_reader.pages)
+    
+    @classmethod
+    def _pdf_page_may_have_text(cls, page: "pypdf.PageObject") -> bool:
+        """Cheap check for a content stream and font resources without decoding the page"""
+        if page.get('/Contents') is None:
+            return False
+        try:
+            return cls._pdf_resources_have_fonts(page.get('/Resources'), 0, set())
+        except Exception:
+            # When in doubt, extract rather than skip
+            return True
+    
+    @classmethod
+    def _pdf_resources_have_fonts(cls, resources, depth: int, seen: set) -> bool:
+        """Look for fonts in a resource dictionary, including those of the Form XObjects it draws"""
+        if resources is None:
+            return False
+        resources = resources.get_object()
+        if '/Font' in resources:
+            return True
+        
+        xobjects = resources.get('/XObject')
+        if xobjects is None:
+            return False
+        for xobject in xobjects.get_object().values():
+            xobject = xobject.get_object()
+            # Forms often share one /XObject dictionary; walk each only once
+            if xobject.get('/Subtype') != '/Form' or id(xobject) in seen:
+                continue
+            seen.add(id(xobject))
+            if depth >= _PDF_FORM_MAX_DEPTH or cls._pdf_resources_have_fonts(xobject.get('/Resources'), depth + 1, seen):
+                return True
+        return False
+    
+    def _extract_from_pdf_with_pdftotext(self, file_path: str) -> str:
+        """Extract text from PDF file using poppler's native pdftotext"""
+        result = subprocess.run(
+            ["pdftotext", "-layout", "-enc", "UTF-8", file_path, "-"],
+            capture_output=True,
+            check=True
+        )
+        return result.stdout.decode("utf-8", "replace")
     
     def _extract_from_docx(self, file_path: str) -> str:
         """Extract text from DOCX file"""
+        # Imported here so workers that never see a DOCX skip loading python-docx and lxml
+        from docx import Document as DocxDocument
+        from lxml import etree
+        
         doc = DocxDocument(file_path)
-        text = ""
-        for paragraph in doc.paragraphs:
-            text += paragraph.text + "\n"
-        return text
+        paragraphs = etree.XPath(_DOCX_PARAGRAPHS_XPATH, namespaces=_DOCX_NAMESPACES)
+        own_runs = etree.XPath(_DOCX_OWN_RUNS_XPATH, namespaces=_DOCX_NAMESPACES)
+        lines = []
+        # Walk <w:p> elements directly rather than building Paragraph/Run wrappers; each paragraph
+        # reads only its own runs so nested text box paragraphs are not repeated in their parent
+        for paragraph in paragraphs(doc.element.body):
+            text = "".join(_docx_run_child_text(child) for run in own_runs(paragraph) for child in run)
+            if text.strip():
+                lines.append(text + "\n")
+        return "".join(lines)
     
     def _extract_from_txt(self, file_path: str) -> str:
         """Extract text from TXT file"""
@@ -105,23 +378,34 @@ class DocumentProcessor:
         """Extract text from Markdown file"""
         with open(file_path, 'r', encoding='utf-8') as file:
             md_content = file.read()
-            # Convert markdown to plain text (basic)
-            return markdown.markdown(md_content)
+        # Strip markdown syntax to plain text (basic)
+        text = _MD_LINK_RE.sub(r'\1', md_content)
+        text = _MD_EMPHASIS_RE.sub(_strip_md_emphasis, text)
+        return _MD_MARKUP_RE.sub("", text)
     
     async def process_all_documents(self) -> dict:
         """Process all documents in the folder"""
         documents = await self.scan_documents_folder()
-        processed_count = 0
+        semaphore = asyncio.Semaphore(settings.max_concurrent_docs or os.cpu_count() or 4)
         
-        for document in documents:
-            try:
+        async def process_one(document: Document) -> bool:
+            async with semaphore:
                 text = await self.extract_text_from_file(document.file_path)
-                if text.strip():
-                    processed_count += 1
-                    # Here we would normally chunk the text and create embeddings
-                    # For now, just count as processed
-            except Exception as e:
-                print(f"Error processing {document.filename}: {e}")
+            # Here we would normally chunk the text and create embeddings
+            # For now, just count as processed
+            return bool(text.strip())
+        
+        results = await asyncio.gather(
+            *(process_one(document) for document in documents),
+            return_exceptions=True
+        )
+        
+        processed_count = 0
+        for document, result in zip(documents, results):
+            if isinstance(result, Exception):
+                logger.error("Error processing %s", document.filename, exc_info=result)
+            elif result:
+                processed_count += 1
         
         return {
             "total_documents": len(documents),
@@ -134,46 +418,47 @@ class DocumentProcessor:
         filename = os.path.basename(filename)
         
         # Remove or replace dangerous characters
-        filename = re.sub(r'[<>:"/\\|?*]', '_', filename)
+        filename = _UNSAFE_CHARS_RE.sub('_', filename)
         
         # Remove leading/trailing dots and spaces
         filename = filename.strip('. ')
         
         # Ensure filename is not empty and not reserved
-        if not filename or filename.lower() in ['con', 'prn', 'aux', 'nul'] + [f'com{i}' for i in range(1, 10)] + [f'lpt{i}' for i in range(1, 10)]:
+        if not filename or filename.lower() in _RESERVED_NAMES:
             filename = f"file_{uuid.uuid4().hex[:8]}"
         
         return filename
     
-    def _generate_unique_filename(self, original_filename: str) -> str:
+    def _generate_unique_filename(self, original_filename: str, upload_time: datetime) -> str:
         """Generate a unique filename with timestamp and UUID to prevent conflicts"""
         sanitized = self._sanitize_filename(original_filename)
         name, ext = os.path.splitext(sanitized)
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        timestamp = upload_time.strftime("%Y%m%d_%H%M%S")
         unique_id = uuid.uuid4().hex[:8]
         return f"{timestamp}_{unique_id}_{name}{ext}"
     
-    def _validate_file_type(self, file_content: bytes, filename: str) -> Tuple[bool, str, str]:
-        """Validate file type using both extension and MIME type detection"""
-        # Check extension
+    def _validate_file_extension(self, filename: str) -> Tuple[bool, str]:
+        """Validate file extension against allowed extensions"""
         file_ext = os.path.splitext(filename)[1].lower()
         if file_ext not in settings.allowed_extensions:
-            return False, "Invalid file extension", ""
+            return False, "Invalid file extension"
         
-        # Detect MIME type from content
-        try:
-            mime_type = magic.from_buffer(file_content, mime=True)
-        except Exception as e:
-            return False, f"Failed to detect file type: {str(e)}", ""
+        return True, "Valid"
+    
+    def _validate_file_type(self, file_content: bytes, filename: str) -> Tuple[bool, str, str]:
+        """Validate file type using MIME type detection"""
+        # Detect MIME type from content, using libmagic only when the header check is inconclusive
+        mime_type = _sniff_mime(file_content, filename)
+        if mime_type is None:
+            try:
+                mime_type = _MAGIC.from_buffer(file_content[:_MIME_SNIFF_SIZE])
+            except Exception as e:
+                return False, f"Failed to detect file type: {str(e)}", ""
         
         # Check if MIME type is allowed
         if mime_type not in settings.allowed_file_types:
             # Handle some common MIME type variations
-            mime_mappings = {
-                "text/x-markdown": "text/markdown",
-                "application/x-empty": "text/plain"  # Empty files
-            }
-            mime_type = mime_mappings.get(mime_type, mime_type)
+            mime_type = _MIME_MAPPINGS.get(mime_type, mime_type)
             
             if mime_type not in settings.allowed_file_types:
                 return False, f"File type not allowed: {mime_type}", mime_type
@@ -190,8 +475,8 @@ class DocumentProcessor:
         
         return True, "Valid"
     
-    async def validate_upload_file(self, upload_file: UploadFile) -> Tuple[bool, List[UploadValidationError]]:
-        """Validate an uploaded file for size, type, and content"""
+    async def validate_upload_file(self, upload_file: UploadFile) -> Tuple[bool, List[UploadValidationError], str]:
+        """Validate an uploaded file for size, type, and content; also returns the detected MIME type"""
         errors = []
         
         if not upload_file.filename:
@@ -200,11 +485,25 @@ class DocumentProcessor:
                 error_type="filename",
                 message="No filename provided"
             ))
-            return False, errors
+            return False, errors, ""
+        
+        # Reject unsupported extensions before paying for the read
+        ext_valid, ext_message = self._validate_file_extension(upload_file.filename)
+        if not ext_valid:
+            errors.append(UploadValidationError(
+                filename=upload_file.filename,
+                error_type="type",
+                message=ext_message
+            ))
+            return False, errors, ""
         
-        # Read file content for validation
+        # Read only the header for type detection and take the size without reading the body
         try:
-            file_content = await upload_file.read()
+            head = await upload_file.read(_MIME_SNIFF_SIZE)
+            file_size = upload_file.size
+            if file_size is None:
+                upload_file.file.seek(0, os.SEEK_END)
+                file_size = upload_file.file.tell()
             await upload_file.seek(0)  # Reset file pointer
         except Exception as e:
             errors.append(UploadValidationError(
@@ -212,10 +511,9 @@ class DocumentProcessor:
                 error_type="read_error",
                 message=f"Failed to read file: {str(e)}"
             ))
-            return False, errors
+            return False, errors, ""
         
         # Validate file size
-        file_size = len(file_content)
         size_valid, size_message = self._validate_file_size(file_size)
         if not size_valid:
             errors.append(UploadValidationError(
@@ -225,7 +523,7 @@ class DocumentProcessor:
             ))
         
         # Validate file type
-        type_valid, type_message, mime_type = self._validate_file_type(file_content, upload_file.filename)
+        type_valid, type_message, mime_type = self._validate_file_type(head, upload_file.filename)
         if not type_valid:
             errors.append(UploadValidationError(
                 filename=upload_file.filename,
@@ -233,39 +531,38 @@ class DocumentProcessor:
                 message=type_message
             ))
         
-        return len(errors) == 0, errors
+        return len(errors) == 0, errors, mime_type
     
-    async def save_uploaded_file(self, upload_file: UploadFile) -> UploadedFileInfo:
-        """Save an uploaded file to the documents folder"""
+    async def save_uploaded_file(self, upload_file: UploadFile, mime_type: Optional[str] = None) -> UploadedFileInfo:
+        """Save an uploaded file to the documents folder, reusing the MIME type from validation if given"""
         # Generate unique filename
-        unique_filename = self._generate_unique_filename(upload_file.filename)
+        upload_time = datetime.now()
+        unique_filename = self._generate_unique_filename(upload_file.filename, upload_time)
         file_path = os.path.join(self.documents_folder, unique_filename)
         
         # Ensure documents folder exists
         os.makedirs(self.documents_folder, exist_ok=True)
         
-        # Read file content
-        file_content = await upload_file.read()
-        
-        # Get MIME type
-        try:
-            mime_type = magic.from_buffer(file_content, mime=True)
-        except Exception:
-            # Fallback to content type from upload
-            mime_type = upload_file.content_type or "application/octet-stream"
+        # Stream the upload to disk in chunks within a single thread hop
+        file_size, first_chunk = await asyncio.to_thread(_write_upload, upload_file.file, file_path)
+        self._scan_cache = None
         
-        # Save file asynchronously
-        async with aiofiles.open(file_path, 'wb') as f:
-            await f.write(file_content)
+        # Get MIME type from the leading bytes unless validation already detected it
+        if not mime_type:
+            try:
+                mime_type = _MAGIC.from_buffer(first_chunk[:_MIME_SNIFF_SIZE])
+            except Exception:
+                # Fallback to content type from upload
+                mime_type = upload_file.content_type or "application/octet-stream"
         
         # Create file info
         file_info = UploadedFileInfo(
             original_filename=upload_file.filename,
             saved_filename=unique_filename,
-            file_size=len(file_content),
+            file_size=file_size,
             content_type=mime_type,
-            upload_timestamp=datetime.now(),
-            document_id=str(uuid.uuid4())
+            upload_timestamp=upload_time,
+            document_id=uuid.uuid5(_DOC_NS, file_path).hex
         )
         
         return file_info
@@ -284,45 +581,56 @@ class DocumentProcessor:
             ))
             return uploaded_files, all_errors
         
-        # Process each file
-        for upload_file in upload_files:
-            try:
-                # Validate file
-                is_valid, validation_errors = await self.validate_upload_file(upload_file)
-                
-                if is_valid:
+        async def process_one(upload_file: UploadFile) -> Tuple[Optional[UploadedFileInfo], List[UploadValidationError]]:
+            async with self._upload_semaphore:
+                try:
+                    # Validate file
+                    is_valid, validation_errors, mime_type = await self.validate_upload_file(upload_file)
+                    
+                    if not is_valid:
+                        return None, validation_errors
+                    
                     # Save file
-                    file_info = await self.save_uploaded_file(upload_file)
-                    uploaded_files.append(file_info)
-                else:
-                    all_errors.extend(validation_errors)
+                    return await self.save_uploaded_file(upload_file, mime_type), []
                     
-            except Exception as e:
-                all_errors.append(UploadValidationError(
-                    filename=upload_file.filename or "unknown",
-                    error_type="processing",
-                    message=f"Unexpected error processing file: {str(e)}"
-                ))
+                except Exception as e:
+                    return None, [UploadValidationError(
+                        filename=upload_file.filename or "unknown",
+                        error_type="processing",
+                        message=f"Unexpected error processing file: {str(e)}"
+                    )]
+        
+        # Process files concurrently; gather keeps results in upload order
+        results = await asyncio.gather(*(process_one(upload_file) for upload_file in upload_files))
+        
+        for file_info, errors in results:
+            if file_info is not None:
+                uploaded_files.append(file_info)
+            all_errors.extend(errors)
         
         return uploaded_files, all_errors
     
     async def get_upload_statistics(self) -> dict:
         """Get statistics about uploaded files"""
-        if not os.path.exists(self.documents_folder):
-            return {"total_files": 0, "uploaded_files": 0, "original_files": 0}
-        
         total_files = 0
         uploaded_files = 0
         original_files = 0
         
-        for filename in os.listdir(self.documents_folder):
-            if self._is_supported_file(filename):
-                total_files += 1
-                # Check if it's an uploaded file based on naming pattern
-                if re.match(r'^\d{8}_\d{6}_[a-f0-9]{8}_', filename):
-                    uploaded_files += 1
-                else:
-                    original_files += 1
+        try:
+            entries = os.scandir(self.documents_folder)
+        except FileNotFoundError:
+            return {"total_files": 0, "uploaded_files": 0, "original_files": 0}
+        
+        with entries:
+            for entry in entries:
+                # Cheap name checks first; is_file() only needs the cached dirent type
+                if self._is_supported_file(entry.name) and entry.is_file():
+                    total_files += 1
+                    # Check if it's an uploaded file based on naming pattern
+                    if _UPLOAD_NAME_RE.match(entry.name):
+                        uploaded_files += 1
+                    else:
+                        original_files += 1
         
         return {
             "total_files": total_files,
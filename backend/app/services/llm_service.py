@@ -1,8 +1,16 @@
 import google.generativeai as genai
 from typing import List, Dict, Any, Optional
+from collections import OrderedDict
 import asyncio
 from app.core.config import settings
 
+# Fixed parts of the chat prompt, built once at import
+_BASE_PROMPT = """You are a helpful assistant that answers questions based on the provided documents. 
+        If you don't have enough information to answer the question, please say so clearly.
+        Always be accurate and cite the source documents when possible."""
+_CONTEXT_HEADER = "\n\nRelevant document excerpts:\n"
+_QUESTION_TEMPLATE = "\n\nUser Question: {message}\n\nResponse:"
+
 class LLMService:
     def __init__(self):
         if settings.gemini_api_key:
@@ -12,6 +20,9 @@ class LLMService:
         else:
             self.model = None
             self.embedding_model = None
+        
+        # LRU cache of query embeddings keyed by normalized query text
+        self._query_embedding_cache: "OrderedDict[str, List[float]]" = OrderedDict()
     
     async def generate_response(
         self, 
@@ -49,19 +60,16 @@ class LLMService:
     
     def _build_prompt(self, message: str, context_documents: Optional[List[Dict[str, Any]]] = None) -> str:
         """Build prompt with context documents for Gemini"""
-        base_prompt = """You are a helpful assistant that answers questions based on the provided documents. 
-        If you don't have enough information to answer the question, please say so clearly.
-        Always be accurate and cite the source documents when possible."""
+        question = _QUESTION_TEMPLATE.format(message=message)
         
         if context_documents:
-            context = "\n\nRelevant document excerpts:\n"
-            for doc in context_documents:
-                context += f"- From {doc.get('filename', 'unknown')}: {doc.get('text', '')}\n"
-            
-            full_prompt = f"{base_prompt}\n{context}\n\nUser Question: {message}\n\nResponse:"
-            return full_prompt
+            context = "".join(
+                f"- From {doc.get('filename', 'unknown')}: {doc.get('text', '')}\n"
+                for doc in context_documents
+            )
+            return f"{_BASE_PROMPT}\n{_CONTEXT_HEADER}{context}{question}"
         
-        return f"{base_prompt}\n\nUser Question: {message}\n\nResponse:"
+        return f"{_BASE_PROMPT}{question}"
     
     async def generate_embeddings(self, texts: List[str]) -> List[List[float]]:
         """Generate embeddings for a list of texts using Gemini"""
@@ -69,21 +77,19 @@ class LLMService:
             print("Gemini API key not configured, returning empty embeddings")
             return []
         
+        if not texts:
+            return []
+        
         try:
-            embeddings = []
-            
-            # Gemini's embed_content works with individual texts
-            for text in texts:
-                # Use the embeddings API
-                result = await asyncio.to_thread(
-                    genai.embed_content,
-                    model="models/text-embedding-004",
-                    content=text,
-                    task_type="retrieval_document"
-                )
-                embeddings.append(result['embedding'])
+            # Embed all texts in one call; the SDK sends them as batched requests
+            result = await asyncio.to_thread(
+                genai.embed_content,
+                model="models/text-embedding-004",
+                content=texts,
+                task_type="retrieval_document"
+            )
             
-            return embeddings
+            return result['embedding']
             
         except Exception as e:
             print(f"Error generating embeddings with Gemini: {e}")
@@ -95,6 +101,13 @@ class LLMService:
             print("Gemini API key not configured")
             return []
         
+        # Embed the normalized text itself so every query sharing a cache key gets the same vector
+        query = query.strip().lower()
+        cached = self._query_embedding_cache.get(query)
+        if cached is not None:
+            self._query_embedding_cache.move_to_end(query)
+            return cached
+        
         try:
             result = await asyncio.to_thread(
                 genai.embed_content,
@@ -103,7 +116,12 @@ class LLMService:
                 task_type="retrieval_query"
             )
             
-            return result['embedding']
+            embedding = result['embedding']
+            self._query_embedding_cache[query] = embedding
+            if len(self._query_embedding_cache) > settings.query_embedding_cache_size:
+                self._query_embedding_cache.popitem(last=False)
+            
+            return embedding
             
         except Exception as e:
             print(f"Error generating query embedding with Gemini: {e}")
@@ -1,10 +1,16 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable
+from collections import defaultdict
 from app.core.config import settings
 import os
+import re
+
+_TOKEN_RE = re.compile(r"\w+")
 
 class VectorStore:
     def __init__(self):
         self.documents = []  # Simple in-memory storage for now
+        self._search_texts = []  # Lowercased document text, parallel to self.documents
+        self._token_index = defaultdict(set)  # Token -> positions in self.documents
         self._initialize_storage()
     
     def _initialize_storage(self):
@@ -21,7 +27,12 @@ class VectorStore:
         """Add documents to the vector store"""
         try:
             # Simple in-memory storage for now
+            start = len(self.documents)
             self.documents.extend(documents)
+            self._search_texts.extend(doc.get("text", "").lower() for doc in documents)
+            for position in range(start, len(self._search_texts)):
+                for token in set(_TOKEN_RE.findall(self._search_texts[position])):
+                    self._token_index[token].add(position)
             print(f"Added {len(documents)} documents to in-memory store")
             return True
             
@@ -38,8 +49,9 @@ class VectorStore:
             results = []
             query_lower = query.lower()
             
-            for doc in self.documents:
-                if query_lower in doc.get("text", "").lower():
+            for position in self._candidate_positions(query_lower):
+                doc = self.documents[position]
+                if query_lower in self._search_texts[position]:
                     results.append({
                         "text": doc.get("text", "")[:200] + "...",
                         "filename": doc.get("filename", "unknown"),
@@ -49,8 +61,8 @@ class VectorStore:
                 if len(results) >= n_results:
                     break
             
-            # If no matches, return placeholder
-            if not results:
+            # If nothing has been added yet, return placeholder
+            if not results and not self.documents:
                 results = [
                     {
                         "text": "This is a placeholder document chunk. No documents have been processed yet.",
@@ -65,6 +77,22 @@ class VectorStore:
             print(f"Error searching vector store: {e}")
             return []
     
+    def _candidate_positions(self, query_lower: str) -> Iterable[int]:
+        """Narrow the substring scan using the token index"""
+        # Only tokens bounded by non-word characters inside the query are
+        # guaranteed to appear as whole tokens in a matching document; the
+        # first and last tokens may be partial words.
+        complete_tokens = [
+            match.group()
+            for match in _TOKEN_RE.finditer(query_lower)
+            if match.start() > 0 and match.end() < len(query_lower)
+        ]
+        if not complete_tokens:
+            return range(len(self._search_texts))
+        
+        postings = sorted((self._token_index.get(token, set()) for token in complete_tokens), key=len)
+        return sorted(set.intersection(*postings))
+    
     def get_collection_info(self) -> Dict[str, Any]:
         """Get information about the collection"""
         try:
@@ -0,0 +1,43 @@
+import asyncio
+
+from app.api import chat as chat_api
+from app.models.chat import ChatRequest
+from app.services.vector_store import VectorStore
+
+
+class _RecordingLLM:
+    def __init__(self):
+        self.context_documents = None
+
+    async def generate_response(self, message, conversation_id, context_documents=None):
+        self.context_documents = context_documents
+        return "ok"
+
+
+def _chat(message, llm, vector_store):
+    return asyncio.run(chat_api.chat(ChatRequest(message=message), llm, vector_store))
+
+
+def test_empty_store_placeholder_is_not_sent_as_context():
+    chat_api._query_cache.clear()
+    llm = _RecordingLLM()
+
+    response = _chat("python", llm, VectorStore())
+
+    assert not llm.context_documents
+    assert [source.filename for source in response.sources] == ["placeholder.txt"]
+
+
+def test_surrounding_whitespace_does_not_change_retrieval():
+    chat_api._query_cache.clear()
+    vector_store = VectorStore()
+    asyncio.run(vector_store.add_documents([{"text": "Skills: python", "filename": "cv.txt"}]))
+    llm = _RecordingLLM()
+
+    _chat("python ", llm, vector_store)
+    padded = llm.context_documents
+    chat_api._query_cache.clear()
+    _chat("python", llm, vector_store)
+
+    assert padded == llm.context_documents
+    assert [doc["filename"] for doc in padded] == ["cv.txt"]
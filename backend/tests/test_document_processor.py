@@ -0,0 +1,234 @@
+import os
+from pathlib import Path
+
+from docx import Document as DocxDocument
+from docx.oxml import parse_xml
+from pypdf import PdfWriter
+from pypdf.generic import ArrayObject, DecodedStreamObject, DictionaryObject, NameObject, NumberObject
+
+from app.core.config import settings
+from app.services.document_processor import DocumentProcessor
+
+_TEXT_BOX_RUN = """
+<w:r xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+     xmlns:mc="http://schemas.openxmlformats.org/markup-compatibility/2006"
+     xmlns:wps="http://schemas.microsoft.com/office/word/2010/wordprocessingShape"
+     xmlns:v="urn:schemas-microsoft-com:vml">
+  <mc:AlternateContent>
+    <mc:Choice Requires="wps">
+      <w:drawing>
+        <wps:txbx>
+          <w:txbxContent>
+            <w:p><w:r><w:t>BOXTEXT</w:t></w:r></w:p>
+          </w:txbxContent>
+        </wps:txbx>
+      </w:drawing>
+    </mc:Choice>
+    <mc:Fallback>
+      <w:pict>
+        <v:shape>
+          <v:textbox>
+            <w:txbxContent>
+              <w:p><w:r><w:t>BOXTEXT</w:t></w:r></w:p>
+            </w:txbxContent>
+          </v:textbox>
+        </v:shape>
+      </w:pict>
+    </mc:Fallback>
+  </mc:AlternateContent>
+</w:r>
+"""
+
+_SPECIAL_CHARS_RUN = """
+<w:r xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">
+  <w:t>555</w:t><w:noBreakHyphen/><w:t>0100</w:t>
+  <w:ptab w:relativeTo="margin" w:alignment="right" w:leader="none"/><w:t>Phone</w:t>
+  <w:br w:type="page"/><w:t>Next</w:t><w:br/><w:t>Line</w:t>
+</w:r>
+"""
+
+
+def test_extract_from_docx_reads_text_boxes_and_tables_once(tmp_path):
+    doc = DocxDocument()
+    doc.add_paragraph("Name\tDate")
+    doc.add_paragraph("")
+    paragraph = doc.add_paragraph("Before box ")
+    paragraph._p.append(parse_xml(_TEXT_BOX_RUN))
+    paragraph = doc.add_paragraph()
+    paragraph._p.append(parse_xml(_SPECIAL_CHARS_RUN))
+    table = doc.add_table(rows=1, cols=2)
+    table.cell(0, 0).text = "Cell A"
+    table.cell(0, 1).text = "Cell B"
+    file_path = tmp_path / "resume.docx"
+    doc.save(file_path)
+
+    text = DocumentProcessor()._extract_from_docx(str(file_path))
+
+    assert text == "Name\tDate\nBefore box \nBOXTEXT\n555-0100\tPhoneNext\nLine\nCell A\nCell B\n"
+
+
+def test_extract_from_markdown_keeps_text_and_unpaired_markers(tmp_path):
+    file_path = tmp_path / "resume.md"
+    file_path.write_text(
+        "# Projects\n"
+        "> Built [**Bold** app](https://example.com) and ![*logo*](logo.png)\n"
+        "Wrote `__init__` and __main__ helpers; 2 * 3 = 6\n"
+        "**Senior** *Python* __Team Lead__ ***Remote***\n"
+    )
+
+    text = DocumentProcessor()._extract_from_markdown(str(file_path))
+
+    assert text == (
+        "Projects\n"
+        "Built Bold app and logo\n"
+        "Wrote __init__ and __main__ helpers; 2 * 3 = 6\n"
+        "Senior Python Team Lead Remote\n"
+    )
+
+
+def _write_form_xobject_pdf(file_path):
+    writer = PdfWriter()
+    page = writer.add_blank_page(300, 300)
+    font = writer._add_object(DictionaryObject({
+        NameObject("/Type"): NameObject("/Font"),
+        NameObject("/Subtype"): NameObject("/Type1"),
+        NameObject("/BaseFont"): NameObject("/Helvetica"),
+    }))
+    form = DecodedStreamObject()
+    form.set_data(b"BT /F1 12 Tf 20 200 Td (Hello from a form XObject) Tj ET")
+    form.update({
+        NameObject("/Type"): NameObject("/XObject"),
+        NameObject("/Subtype"): NameObject("/Form"),
+        NameObject("/BBox"): ArrayObject([NumberObject(0), NumberObject(0), NumberObject(300), NumberObject(300)]),
+        NameObject("/Resources"): DictionaryObject({
+            NameObject("/Font"): DictionaryObject({NameObject("/F1"): font}),
+        }),
+    })
+    contents = DecodedStreamObject()
+    contents.set_data(b"q /Fm1 Do Q")
+    page[NameObject("/Resources")] = DictionaryObject({
+        NameObject("/XObject"): DictionaryObject({NameObject("/Fm1"): writer._add_object(form)}),
+    })
+    page[NameObject("/Contents")] = writer._add_object(contents)
+    writer.write(file_path)
+
+
+def test_extract_from_pdf_reads_text_drawn_by_form_xobjects(tmp_path):
+    file_path = tmp_path / "resume.pdf"
+    _write_form_xobject_pdf(file_path)
+
+    text = DocumentProcessor()._extract_from_pdf(str(file_path))
+
+    assert "Hello from a form XObject" in text
+
+
+def test_extract_from_pdf_skips_pages_without_fonts(tmp_path):
+    writer = PdfWriter()
+    writer.add_blank_page(300, 300)
+    file_path = tmp_path / "scan.pdf"
+    writer.write(file_path)
+
+    assert DocumentProcessor()._extract_from_pdf(str(file_path)) == ""
+
+
+def test_pdf_font_probe_walks_shared_form_xobjects_once(monkeypatch):
+    # Three levels of forms; every form on a level draws all forms of the next one
+    # through a single shared /XObject dictionary
+    fan_out, levels = 10, 3
+    next_resources = DictionaryObject()
+    for _ in range(levels):
+        shared = DictionaryObject()
+        for index in range(fan_out):
+            form = DecodedStreamObject()
+            form.update({
+                NameObject("/Subtype"): NameObject("/Form"),
+                NameObject("/Resources"): next_resources,
+            })
+            shared[NameObject(f"/Fm{index}")] = form
+        next_resources = DictionaryObject({NameObject("/XObject"): shared})
+
+    walk = DocumentProcessor._pdf_resources_have_fonts.__func__
+    calls = []
+
+    def counting_walk(cls, *args):
+        calls.append(args)
+        return walk(cls, *args)
+
+    monkeypatch.setattr(DocumentProcessor, "_pdf_resources_have_fonts", classmethod(counting_walk))
+
+    assert not DocumentProcessor._pdf_resources_have_fonts(next_resources, 0, set())
+    assert len(calls) == 1 + levels * fan_out
+
+
+def _processor_for(folder):
+    processor = DocumentProcessor()
+    processor.documents_folder = str(folder)
+    processor._extract_cache_dir = Path(folder) / ".extract_cache"
+    return processor
+
+
+def test_content_key_depends_on_pdf_backend(tmp_path, monkeypatch):
+    processor = _processor_for(tmp_path)
+    pdf_path = tmp_path / "resume.pdf"
+    txt_path = tmp_path / "resume.txt"
+    pdf_path.write_bytes(b"%PDF-1.4")
+    txt_path.write_text("Skills: python")
+
+    monkeypatch.setattr(settings, "use_pdftotext", False)
+    pypdf_keys = processor._content_key(str(pdf_path)), processor._content_key(str(txt_path))
+    monkeypatch.setattr(settings, "use_pdftotext", True)
+    pdftotext_keys = processor._content_key(str(pdf_path)), processor._content_key(str(txt_path))
+
+    assert pypdf_keys[0] != pdftotext_keys[0]
+    assert pypdf_keys[1] == pdftotext_keys[1]
+
+
+def test_extract_cache_evicts_least_recently_used_entries(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "extract_cache_max_mb", 1)
+    processor = _processor_for(tmp_path)
+    padding = "x" * (400 * 1024)
+    paths = []
+    for index in range(3):
+        path = tmp_path / f"doc{index}.txt"
+        path.write_text(f"{index}{padding}")
+        paths.append(str(path))
+
+    processor._extract_sync(paths[0])
+    processor._extract_sync(paths[1])
+    for age, path in enumerate(paths[:2], start=1):
+        entry = processor._extract_cache_dir / f"{processor._content_key(path)}.txt"
+        os.utime(entry, (age, age))
+    # A cache hit on the first entry makes the second the least recently used
+    processor._extract_sync(paths[0])
+    processor._extract_sync(paths[2])
+
+    cached = {entry.name for entry in processor._extract_cache_dir.iterdir()}
+    assert f"{processor._content_key(paths[0])}.txt" in cached
+    assert f"{processor._content_key(paths[1])}.txt" not in cached
+    assert f"{processor._content_key(paths[2])}.txt" in cached
+
+
+def test_extract_cache_round_trips_lone_surrogates(tmp_path, monkeypatch):
+    processor = _processor_for(tmp_path)
+    path = tmp_path / "doc.txt"
+    path.write_text("Skills: python")
+    monkeypatch.setattr(processor, "_extract_by_type", lambda file_path: "bad \ud800 glyph")
+
+    assert processor._extract_sync(str(path)) == "bad \ud800 glyph"
+    monkeypatch.setattr(processor, "_extract_by_type", lambda file_path: "not cached")
+    assert processor._extract_sync(str(path)) == "bad \ud800 glyph"
+    assert not list(processor._extract_cache_dir.glob("*.tmp"))
+
+
+def test_extract_cache_removes_temp_file_when_write_fails(tmp_path, monkeypatch):
+    processor = _processor_for(tmp_path)
+    path = tmp_path / "doc.txt"
+    path.write_text("Skills: python")
+
+    def fail_replace(src, dst):
+        raise OSError(28, "No space left on device")
+
+    monkeypatch.setattr(os, "replace", fail_replace)
+
+    assert processor._extract_sync(str(path)) == "Skills: python"
+    assert not list(processor._extract_cache_dir.iterdir())